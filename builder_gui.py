@@ -28,15 +28,17 @@
 #----------------------------------------------------------------------------- IMPORTS --#
 
 # Default Python Imports
-from PySide2 import QtGui, QtWidgets
+from PySide2 import QtWidgets
 from maya import OpenMayaUI as omui
 from shiboken2 import wrapInstance
 import maya.cmds as cmds
+from functools import partial
 import random
 
 # Imports that you wrote
 from td_maya_tools.stacker import stack_objs, get_center_point
-from td_maya_tools.stacker import create_stack, offset_objs_in_x
+from td_maya_tools.stacker import create_stack, get_x_bounds, spread_objs_in_x
+from td_maya_tools.stacker import BOTTOM
 from td_maya_tools.gen_utils import read_stack_xml
 
 #----------------------------------------------------------------------------------------#
@@ -50,7 +52,7 @@ def get_maya_window():
     :type: pointer
     """
     maya_main_window_ptr = omui.MQtUtil.mainWindow()
-    return wrapInstance(long(maya_main_window_ptr), QtWidgets.QWidget)
+    return wrapInstance(int(maya_main_window_ptr), QtWidgets.QWidget)
 
 #----------------------------------------------------------------------------------------#
 #--------------------------------------------------------------------------- CLASSES ----#
@@ -72,6 +74,7 @@ class BuilderGUI(QtWidgets.QDialog):
         self.top_objects = None
         self.mid_objects = None
         self.bottom_objects = None
+        self.selection_groups = None
 
         self.btn_01 = None
         self.btn_02 = None
@@ -108,9 +111,9 @@ class BuilderGUI(QtWidgets.QDialog):
         self.btn_06 = QtWidgets.QPushButton('Load XML')
 
         # Add a clicked event.
-        self.btn_01.clicked.connect(self.set_selection)
-        self.btn_02.clicked.connect(self.set_selection)
-        self.btn_03.clicked.connect(self.set_selection)
+        self.btn_01.clicked.connect(partial(self.set_selection, 'top'))
+        self.btn_02.clicked.connect(partial(self.set_selection, 'mid'))
+        self.btn_03.clicked.connect(partial(self.set_selection, 'bottom'))
         self.btn_04.clicked.connect(self.make_stacks)
         self.btn_05.clicked.connect(self.close)
         self.btn_06.clicked.connect(self.apply_xml)
@@ -158,6 +161,11 @@ class BuilderGUI(QtWidgets.QDialog):
         self.mid_group.setReadOnly(True)
         self.bottom_group.setReadOnly(True)
 
+        # Line edit and attribute that each group's selection goes to
+        self.selection_groups = {'top': (self.top_group, 'top_objects'),
+                                 'mid': (self.mid_group, 'mid_objects'),
+                                 'bottom': (self.bottom_group, 'bottom_objects')}
+
         lbl_01 = QtWidgets.QLabel('Set Stack Count')
         lbl_02 = QtWidgets.QLabel('Set Max Height')
         lbl_03 = QtWidgets.QLabel('Set Separation')
@@ -167,6 +175,11 @@ class BuilderGUI(QtWidgets.QDialog):
         self.max_height = QtWidgets.QSpinBox()
         self.sep_value = QtWidgets.QDoubleSpinBox()
 
+        # Keep the values in range, the spin boxes won't accept anything outside of it
+        self.num_stack.setMinimum(1)
+        self.max_height.setRange(1, 6)
+        self.sep_value.setMinimum(0.1)
+
         # Set some default values
         self.num_stack.setValue(3)
         self.max_height.setValue(3)
@@ -206,36 +219,25 @@ class BuilderGUI(QtWidgets.QDialog):
 
         return layout
 
-    def set_selection(self):
+    def set_selection(self, role=None, checked=False):
         """
-        Tells us which button was clicked, and completes the appropriate operation.
+        Stores the current selection as the objects of one group. Each of the set
+        buttons is connected with the group it sets.
+
+        :param role: The group to set, 'top', 'mid' or 'bottom'.
+        :type: str
+
+        :param checked: Checked state passed along by the clicked signal, unused.
+        :type: bool
         """
-        clicked = self.sender()
+        line_edit, attr = self.selection_groups[role]
 
         sel = cmds.ls(selection=True)
-        count = 0
-        for i in range(len(sel)):
-            count+=1
-
-        amount = "%s objects" % str(count)
-
-        if clicked == self.btn_01:
-            # Select the top objects
-            self.top_objects = sel
-            self.top_group.setText(amount)
-            self.top_group.setStyleSheet('background-color: seagreen')
-
-        elif clicked == self.btn_02:
-            # Select the mid objects
-            self.mid_objects = sel
-            self.mid_group.setText(amount)
-            self.mid_group.setStyleSheet('background-color: seagreen')
-
-        elif clicked == self.btn_03:
-            # Select the bottom objects
-            self.bottom_objects = sel
-            self.bottom_group.setText(amount)
-            self.bottom_group.setStyleSheet('background-color: seagreen')
+        amount = "%d objects" % len(sel)
+
+        setattr(self, attr, sel)
+        line_edit.setText(amount)
+        line_edit.setStyleSheet('background-color: seagreen')
 
     def make_stacks(self):
         """
@@ -253,76 +255,106 @@ class BuilderGUI(QtWidgets.QDialog):
         if status_new is None:
             return None
 
-        stacks = int(self.num_stack.text())
-        for i in range(stacks):
-            # Randomly choose an obj from each list
-            top_obj = random.choice(self.top_objects)
-            bottom_obj = random.choice(self.bottom_objects)
-
-            # Creating names for the duplicate objects
-            top_name = 'second_top%s' % str(i+1)
-            bottom_name = 'second_bottom%s' % str(i+1)
-
-            # Duplicate the chosen objects
-            dup_top = cmds.duplicate(top_obj, n = top_name)
-            dup_bottom = cmds.duplicate(bottom_obj, n = bottom_name)
-
-            # Create a group name and make a group of the duplicate objects
-            grp_name = 'stack00%s' % str(i + 1)
-            cmds.group(dup_top, dup_bottom, n=grp_name)
-
-            # Select a random number of middle objects based on input.
-            number_in_middle = random.randint(1,int(self.max_height.text()))
-
-            list_of_objects = [dup_bottom]
-            tree_list = [top_name]
-
-            for j in range(number_in_middle):
-                mid_obj = random.choice(self.mid_objects)
-                mid_name = 'second_mid%s_%s' % (grp_name[-1], str(j + 1))
-                dup_mid = cmds.duplicate(mid_obj, n=mid_name)
-                cmds.parent(dup_mid, grp_name)
-                list_of_objects.append(dup_mid)
-                tree_list.append(mid_name)
-
-            list_of_objects.append(dup_top)
-            tree_list.append(bottom_name)
-
-            # Move the base object to the origin
-            bottom_center = get_center_point(dup_bottom,0,1)
-            origin = [0,0,0]
-            create_stack(dup_bottom, bottom_center, origin)
-
-            stack_objs(list_of_objects)
-
-            # Set the pivot point to the origin
-            cmds.move(0, 0, 0, grp_name + '.scalePivot', grp_name + '.rotatePivot'
-                      , absolute = True)
-
-            self.add_stack_to_tree_view(grp_name,tree_list)
-
-        for j in range(stacks-1):
-            obj_static = 'stack00%s' % str(j+1)
-            obj_move   = 'stack00%s' % str(j+2)
-            offset_objs_in_x(obj_static, obj_move, self.sep_value.value())
+        # Read the user's input once, rather than from the widgets inside the loops.
+        stacks = self.num_stack.value()
+        max_h = self.max_height.value()
+        sep = self.sep_value.value()
+
+        # Turn off the evaluation manager and hold the viewport until done, so Maya
+        # doesn't evaluate and redraw the scene after every command. All of the edits
+        # are collected into a single undo step.
+        prev_em = cmds.evaluationManager(query=True, mode=True)
+        cmds.evaluationManager(mode='off')
+        cmds.refresh(suspend=True)
+        cmds.undoInfo(openChunk=True)
+
+        # Same for the tree view, it only lays out and repaints once all stacks are in.
+        sorting = self.tree_view.isSortingEnabled()
+        self.tree_view.setUpdatesEnabled(False)
+        self.tree_view.setSortingEnabled(False)
+        try:
+            # Bounding boxes are queried once per object and kept up to date as
+            # the objects get moved.
+            bb_cache = {}
+
+            # Names and x bounds of each stack, to space them out once they're built.
+            grp_names = []
+            x_bounds = []
+
+            # Randomly choose an obj from each list for every stack up front, with a
+            # random number of middle objects based on input.
+            tops = random.choices(self.top_objects, k=stacks)
+            bottoms = random.choices(self.bottom_objects, k=stacks)
+            heights = [random.randint(1, max_h) for _ in range(stacks)]
+            mids = [random.choices(self.mid_objects, k=h) for h in heights]
+
+            for i in range(stacks):
+                top_obj = tops[i]
+                bottom_obj = bottoms[i]
+                mid_objs = mids[i]
+
+                # Creating names for the duplicate objects and the group
+                top_name = 'second_top%d' % (i + 1)
+                bottom_name = 'second_bottom%d' % (i + 1)
+                grp_name = 'stack%03d' % (i + 1)
+
+                # Duplicate the chosen objects
+                dup_top = cmds.duplicate(top_obj, n = top_name)[0]
+                dup_bottom = cmds.duplicate(bottom_obj, n = bottom_name)[0]
+
+                # The stack is filled in from the bottom, the ends are the top and
+                # bottom objects with the middle objects in between.
+                number_in_middle = heights[i]
+                list_of_objects = [None] * (number_in_middle + 2)
+                tree_list = [None] * (number_in_middle + 2)
+                list_of_objects[0] = dup_bottom
+                list_of_objects[-1] = dup_top
+                tree_list[0] = top_name
+                tree_list[-1] = bottom_name
+
+                for j, mid_obj in enumerate(mid_objs):
+                    mid_name = 'second_mid%d_%d' % (i + 1, j + 1)
+                    list_of_objects[j + 1] = cmds.duplicate(mid_obj, n=mid_name)[0]
+                    tree_list[j + 1] = mid_name
+
+                # Group the whole stack in one call instead of parenting each mid
+                cmds.group(list_of_objects, n=grp_name)
+
+                # Move the base object to the origin
+                bottom_center = get_center_point(dup_bottom,BOTTOM,bb_cache)
+                origin = [0,0,0]
+                create_stack(dup_bottom, bottom_center, origin, bb_cache)
+
+                stack_objs(list_of_objects, bb_cache)
+                grp_names.append(grp_name)
+                x_bounds.append(get_x_bounds(list_of_objects, bb_cache))
+
+                # Set the pivot point to the origin
+                cmds.move(0, 0, 0, grp_name + '.scalePivot', grp_name + '.rotatePivot'
+                          , absolute = True)
+
+                self.add_stack_to_tree_view(grp_name,tree_list)
+
+            spread_objs_in_x(grp_names, x_bounds, sep)
+        finally:
+            self.tree_view.setSortingEnabled(sorting)
+            self.tree_view.setUpdatesEnabled(True)
+            cmds.undoInfo(closeChunk=True)
+            cmds.refresh(suspend=False)
+            cmds.evaluationManager(mode=prev_em[0])
+            cmds.refresh(force=True)
 
         return True
 
     def verify_args(self):
         """
         Makes sure GUI has all info it needs by checking the three
-        groups are not empty, requiring the number to stack box to be filled out,
-        and only allowing integers to be entered into he number to stack box.
+        groups are not empty. The stack count, max height and separation value are
+        kept in range by their spin boxes.
 
         :return: Validity of all of the arguments value's
         :type: bool
         """
-        # Set up an int validator to prevent any other type being entered in
-        bound = QtGui.QIntValidator()
-
-        # Make sure only ints are allowed by setting a lower bound
-        bound.setBottom(0)
-
         # Checks if any of the group line edits are empty
         if not self.top_group.text():
             message = 'You must set a selection for the top objects.'
@@ -340,28 +372,6 @@ class BuilderGUI(QtWidgets.QDialog):
             self.warn_user(title, message)
             return None
 
-        # Checks if the num_stack line edit if filled with a value OR
-        # Checks to make sure stack count is at least 1
-        elif not self.num_stack.hasAcceptableInput() or int(self.num_stack.text()) < 1:
-            message =  'The number of stacks needs to be an integer that is at least 1'
-            title = 'Incorrect format'
-            self.warn_user(title,message)
-            return None
-
-        # The max height is anything between 1 to 6
-        elif int(self.max_height.text()) < 1 or int(self.max_height.text()) > 6:
-                message = 'The max height should be a number from 1 to 6'
-                title = 'Incorrect max height'
-                self.warn_user(title,message)
-                return None
-
-        # The separation value must at least be 0.1
-        elif float(self.sep_value.text()) < 0.1:
-            message = 'The separation value must be at least 0.1'
-            title = 'Incorrect separation value'
-            self.warn_user(title,message)
-            return None
-
         return True
 
     def add_stack_to_tree_view(self, grp_name = None, args_list = None):
@@ -373,11 +383,11 @@ class BuilderGUI(QtWidgets.QDialog):
         :param args_list: Names of objects belonging to a particular stack
         :type: list
         """
-        group = QtWidgets.QTreeWidgetItem(self.tree_view,[grp_name])
-
-        for obj in args_list:
-            node = QtWidgets.QTreeWidgetItem(group)
-            node.setText(0, str(obj))
+        # Fill in the group before it goes into the tree view, so the view is only
+        # told about the new rows once.
+        group = QtWidgets.QTreeWidgetItem([grp_name])
+        group.addChildren([QtWidgets.QTreeWidgetItem([str(obj)]) for obj in args_list])
+        self.tree_view.addTopLevelItem(group)
 
     def apply_xml(self):
         """
@@ -393,24 +403,29 @@ class BuilderGUI(QtWidgets.QDialog):
         if not filename:
             return None
 
-        #xml_path = filename
-        dict = read_stack_xml(filename)
+        stacks_xml = read_stack_xml(filename)
 
         # Make sure the file is not empty.
-        if not dict:
+        if not stacks_xml:
             message = 'The xml file provided was empty after reading.'
             title = 'Empty file'
             self.warn_user(title,message)
             return None
 
-        for key in dict:
-            #Key will access the first subroot maya_stacks
-            for j in dict[key]:
-                # I will access the sec. subroot stack00_
-                #for i in dict[key][j]:
-                    #obj_list.append(value)
-                cmds.move(dict[key][j]['tx'], dict[key][j]['ty'],
-                          dict[key][j]['tz'], j, absolute=True)
+        # grp is the first subroot maya_stacks, name the sec. subroot stack00_
+        items = [(name, xyz['tx'], xyz['ty'], xyz['tz'])
+                 for grp, objs in stacks_xml.items() for name, xyz in objs.items()]
+
+        # Apply every translation as a single undo step, without redrawing in between.
+        cmds.undoInfo(openChunk=True)
+        cmds.refresh(suspend=True)
+        try:
+            for name, tx, ty, tz in items:
+                cmds.xform(name, translation=(tx, ty, tz), absolute=True,
+                           worldSpace=True)
+        finally:
+            cmds.undoInfo(closeChunk=True)
+            cmds.refresh(suspend=False)
 
         return True
 
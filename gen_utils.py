@@ -13,7 +13,7 @@
 
 :description:
     File containing ability to read XML files, it does this
-    with the Perl method of creating dictionaries.
+    by streaming through the file and filling in nested dictionaries.
 
 :applications:
     Maya
@@ -41,36 +41,27 @@ def read_stack_xml(file_path = None):
     :param file_path: A path to a file in the computer's directory
     :type: str
 
-    :return: Contents of the file stored in a dictionary
+    :return: Contents of the file stored in a dictionary, with the values as floats
     :type: dict
     """
     if not os.path.isfile(file_path):
         return None
 
-    xml_fh = et.parse(file_path)
-    root = xml_fh.getroot()
-
-    contents = Autovivification()
-    groups = root.getchildren()
-    for stack in groups:
-        vector = stack.getchildren()
-        for i in vector:
-            point = i.getchildren()
-            for comp in point:
-                value = comp.attrib['value']
-                contents[stack.tag][i.tag][comp.tag] = value
-    return contents
-
-#----------------------------------------------------------------------------------------#
-#----------------------------------------------------------------------------- CLASSES --#
-
-class Autovivification(dict):
-    """
-    This is a Python implementation of Perl's autovivification feature.
-    """
-    def __getitem__(self, item):
-        try:
-            return dict.__getitem__(self, item)
-        except KeyError:
-            value = self[item] = type(self)()
-            return value
\ No newline at end of file
+    contents = {}
+
+    # Tags of the elements currently open, from the root down.
+    path = []
+    for event, elem in et.iterparse(file_path, events=('start', 'end')):
+        if event == 'start':
+            path.append(elem.tag)
+            continue
+
+        path.pop()
+        if len(path) == 3:
+            # A component, e.g. stacks/maya_stacks/stack001/tx
+            stack = contents.setdefault(path[1], {})
+            stack.setdefault(path[2], {})[elem.tag] = float(elem.attrib['value'])
+        else:
+            # Free anything already read so the tree never builds up in memory.
+            elem.clear()
+    return contents
\ No newline at end of file
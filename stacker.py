@@ -32,47 +32,65 @@
 import maya.cmds as cmds
 # Imports That You Wrote
 
+#----------------------------------------------------------------------------------------#
+#----------------------------------------------------------------------------- GLOBALS --#
+
+# Modes for get_center_point(), picking which height of the bounding box to return.
+CENTER = 0
+TOP = 1
+BOTTOM = 2
+
 #----------------------------------------------------------------------------------------#
 #--------------------------------------------------------------------------- FUNCTIONS --#
 
-def offset_objs_in_x(obj_static = None, obj_move = None, offset_val = None):
+def get_x_bounds(obj_list = None, bb_cache = None):
     """
-    Moves an object so that the two input geos are at a certain distance apart.
-    :param obj_static: Transform node of obj not to be moved.
-    :type: str
+    Finds how far a set of objects reaches along x, using their bounding boxes.
 
-    :param obj_move: Transform node of obj to be moved.
-    :type: str
+    :param obj_list: Transform nodes to measure, e.g. every object in one stack.
+    :type: list of str
 
-    :param offset_val: Amount to offset in x (between the bounding boxes of objects).
-    :type: int
+    :param bb_cache: Bounding boxes already queried, keyed by object name.
+    :type: dict
+
+    :return: The lowest and highest x value covered by the objects.
+    :type: tuple
     """
-    static_center_prev = get_center_point(obj_static)
-    move_center_prev = get_center_point(obj_move)
-    cmds.move(static_center_prev[0] - move_center_prev[0],
-              0, 0, obj_move, relative = True)
+    bounds = [get_bounding_box(obj, bb_cache) for obj in obj_list]
+    return min(b[0] for b in bounds), max(b[3] for b in bounds)
 
-    static_bounds = []
-    static_bounds = cmds.xform(obj_static, query = True, boundingBox = True)
-    static_center_new = get_center_point(obj_static)
-    static_dist = static_bounds[3] - static_center_new[0]
+def spread_objs_in_x(obj_list = None, x_bounds = None, offset_val = None):
+    """
+    Moves objects along x so that each one sits a certain distance past the one
+    before it, the first object is not moved. The placements are worked out from the
+    x bounds up front so every object only has to be moved once.
 
-    move_bounds = []
-    move_bounds = cmds.xform(obj_move, query=True, boundingBox=True)
-    move_center_new = get_center_point(obj_move)
-    move_dist = move_center_new[0] - move_bounds[0]
+    :param obj_list: Transform nodes to line up, in order.
+    :type: list of str
 
-    #last_char = int(obj_move[-1])
-    offset_to = offset_val + static_dist + move_dist
-    cmds.move(offset_to, 0, 0, obj_move, relative = True)
+    :param x_bounds: The (min, max) x bounds of each object, as from get_x_bounds().
+    :type: list of tuple
 
-def stack_objs(arg_list = None):
+    :param offset_val: Amount to offset in x (between the bounding boxes of objects).
+    :type: float
+    """
+    # The highest x reached by the objects placed so far.
+    edge = x_bounds[0][1]
+    for obj, (x_min, x_max) in zip(obj_list[1:], x_bounds[1:]):
+        offset_to = edge + offset_val - x_min
+        cmds.move(offset_to, 0, 0, obj, relative = True)
+        edge = x_max + offset_to
+
+def stack_objs(arg_list = None, bb_cache = None):
     """
     This function stacks objects through the use of helper functions.
 
     :param arg_list: List of objects to stack.
     :type: list of str
 
+    :param bb_cache: Bounding boxes already queried, keyed by object name.
+    :type: dict
+
     :return: Describes the success (or failure) of the operation.
     :type: bool
     """
@@ -83,17 +101,17 @@ def stack_objs(arg_list = None):
 
     for i in range(len(arg_list) - 1):
         # get the top center of the base object
-        top_center = get_center_point(arg_list[i], 1, 0)
+        top_center = get_center_point(arg_list[i], TOP, bb_cache)
 
         # get the bottom center of the object to be placed directly above
-        bottom_center = get_center_point(arg_list[i + 1], 0, 1)
+        bottom_center = get_center_point(arg_list[i + 1], BOTTOM, bb_cache)
 
         # move the above object so it's resting on the lower object
-        create_stack(arg_list[i + 1], bottom_center, top_center)
+        create_stack(arg_list[i + 1], bottom_center, top_center, bb_cache)
 
     return True
 
-def create_stack(object_name=None,bottom_center=None,new_point=None):
+def create_stack(object_name=None,bottom_center=None,new_point=None,bb_cache=None):
     """
     Finds out how much to move the object and moves it so that its bottom center point
     is sitting at the same location as the new point.
@@ -106,64 +124,101 @@ def create_stack(object_name=None,bottom_center=None,new_point=None):
 
     :param new_point: The point in space to place this object (x,y,z values)
     :type: list
+
+    :param bb_cache: Bounding boxes already queried, keyed by object name.
+    :type: dict
     """
     # Solve for the distance inbetween the bottomCenter and newPoint
     dist = [new_point[0] - bottom_center[0],
             new_point[1] - bottom_center[1],
             new_point[2] - bottom_center[2]]
 
+    # Nothing to do if the object is already sitting on the new point
+    if not any(dist):
+        return
+
     # Call the move command to place the object
     cmds.move(dist[0], dist[1], dist[2], object_name, relative = True)
+    shift_bounding_box(object_name, dist, bb_cache)
+
+def get_bounding_box(object_name=None, bb_cache=None):
+    """
+    Uses the 'xform' command to get the bounding box of the object passed in.
+    If a cache is given, Maya is only queried the first time an object is asked for.
+
+    :param object_name: The name of an object
+    :type: str
+
+    :param bb_cache: Bounding boxes already queried, keyed by object name.
+    :type: dict
+
+    :return: The bounding box in the form [xmin,ymin,zmin,xmax,ymax,zmax]
+    :type: list
+    """
+    if bb_cache is None:
+        return cmds.xform(object_name, query = True, boundingBox = True)
+
+    if object_name not in bb_cache:
+        bb_cache[object_name] = cmds.xform(object_name, query = True, boundingBox = True)
+    return bb_cache[object_name]
+
+def shift_bounding_box(object_name=None, dist=None, bb_cache=None):
+    """
+    Keeps a cached bounding box in sync after its object was moved by a relative
+    amount, so it never has to be queried from Maya again.
 
+    :param object_name: The name of the object that was moved
+    :type: str
 
-def get_center_point(object_name=None,top_flag=0,bottom_flag=0):
+    :param dist: The relative amount the object was moved by (x,y,z values)
+    :type: list
+
+    :param bb_cache: Bounding boxes already queried, keyed by object name.
+    :type: dict
+    """
+    if not bb_cache or object_name not in bb_cache:
+        return
+
+    bound_coord = bb_cache[object_name]
+    bb_cache[object_name] = [bound_coord[0] + dist[0],
+                             bound_coord[1] + dist[1],
+                             bound_coord[2] + dist[2],
+                             bound_coord[3] + dist[0],
+                             bound_coord[4] + dist[1],
+                             bound_coord[5] + dist[2]]
+
+def get_center_point(object_name=None,mode=CENTER,bb_cache=None):
     """
     Uses the 'xform' command to get the bounding box of the object passed in.
 
     :param object_name: The name of an object to move
     :type: str
 
-    :param top_flag: A flag that indicates if it is getting the top center.
-    0 for false, 1 for true
+    :param mode: Which center to get. CENTER (0) for the middle of the object,
+    TOP (1) for the top center and BOTTOM (2) for the bottom center.
     :type: int
 
-    :param bottom_flag: A flag that indicates if it is getting the bottom center.
-    0 for false, 1 for true
-    :type: int
+    :param bb_cache: Bounding boxes already queried, keyed by object name.
+    :type: dict
 
-    :return: Returns a list with the top center coordinates (x,y,z) if the top center
-    flag is set to true.
-	Returns a list with the bottom center coordinates (x, y, z) if the bottom center
-	flag is set to true.
+    :return: Returns a list with the center coordinates (x,y,z) picked by the mode.
     :type: list
     """
-    
-    bound_coord = []
     # Get the bounding box coordinates using the xform command, it will return a list
     # in the form [xmin,ymin,zmin,xmax,ymax,zmax]
-    bound_coord = cmds.xform(object_name, query = True, boundingBox = True)
-    center_coord = []
+    bound_coord = get_bounding_box(object_name, bb_cache)
 
     '''
     center_coord x and z positions are an average of the bounding box info from
     the bound_coord list so it finds the middle position of the object.
-    The y is left blank at 0 for now, because this info depends on whether the function
-    call set the topFlag or bottomFlag to true.
+    The y is looked up from the middle, the max or the min of the bounding box,
+    indexed by the mode.
     '''
+    heights = ((bound_coord[1] + bound_coord[4])/2, bound_coord[4], bound_coord[1])
     center_coord = [(bound_coord[0] + bound_coord[3])/2,
-                   (bound_coord[1] + bound_coord[4])/2,
-                   (bound_coord[2] + bound_coord[5])/2]
-
-    if top_flag == 1 and bottom_flag == 0:
-        # return the top center
-        center_coord[1] = bound_coord[4]
-        return center_coord
-    elif top_flag == 0 and bottom_flag == 1:
-        # return the bottom center
-        center_coord[1]= bound_coord[1]
-        return center_coord
-    else:
-        return center_coord
+                    heights[mode],
+                    (bound_coord[2] + bound_coord[5])/2]
+    return center_coord
 
 def verify_args(arg_list = None):
     """
@@ -173,14 +228,8 @@ def verify_args(arg_list = None):
     :type: list
 
     :return: Presence of a value in all arguments, returns True.
-    Otherwise, returns False.
+    Otherwise (or if no list was given), returns None.
     :type: bool
     """
-    # Search through parameters to see if a value is equal to None
-    for e in arg_list:
-        if e is None:
-            return None
-        else:
-            continue
-
-    return True
+    # Make sure there is a list, and that none of its values are equal to None
+    return True if arg_list and all(e is not None for e in arg_list) else None